@@ -1,6 +1,7 @@
 """Plexos model enums that define the data schema."""
 
 from enum import Enum, StrEnum
+from functools import cache
 
 
 class Schema(Enum):
@@ -118,9 +119,12 @@ class CollectionEnum(StrEnum):
     Constraints = "Constraints"
 
 
+@cache
+def _members_by_name(schema_enum: type[Enum]) -> dict[str, Enum]:
+    """Return the members of the enum by name, built once per enum."""
+    return {e.name: e for e in schema_enum}
+
+
 def str2enum(string, schema_enum=Schema) -> Schema | None:
     """Convert string to enum."""
-    for e in schema_enum:
-        if e.name == string:
-            return e
-    return None
+    return _members_by_name(schema_enum).get(string)  # type: ignore[return-value]
@@ -3,18 +3,46 @@
 import sqlite3
 import uuid
 import xml.etree.ElementTree as ET  # noqa: N817
-from collections.abc import Sequence
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
 from importlib.resources import files
+from itertools import groupby
 from pathlib import Path
 from typing import Any
 
 from loguru import logger
 
-from .utils import batched, no_space
+from .utils import batched, get_sql_query, no_space, nocase
 from .enums import ClassEnum, CollectionEnum, Schema, str2enum
 from .xml_handler import XMLHandler
 
 SYSTEM_CLASS_NAME = "System"
+SCHEMA_FNAME = "schema.sql"
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Queries used on the `add_*` methods. Built once since they are called in loops.
+_INSERT_ATTRIBUTE_DATA_QUERY = (
+    f"INSERT INTO {Schema.AttributeData.name}(object_id, attribute_id, value) VALUES(?, ?, ?)"
+)
+_CATEGORY_MAX_RANK_QUERY = f"SELECT max(rank) FROM {Schema.Categories.name} WHERE class_id = :class_id"
+_INSERT_CATEGORY_QUERY = f"INSERT INTO {Schema.Categories.name}(class_id, rank, name) VALUES(?, ?, ?)"
+_INSERT_OBJECT_QUERY = (
+    f"INSERT INTO {Schema.Objects.name}(name, class_id, category_id, GUID, description) VALUES(?, ?, ?, ?, ?)"
+)
+_INSERT_MEMBERSHIP_QUERY = (
+    f"INSERT INTO {Schema.Memberships.name}"
+    "(parent_class_id, parent_object_id, child_class_id, child_object_id, collection_id) "
+    "VALUES(?, ?, ?, ?, ?)"
+)
+# Text of the BIT columns on the XML.
+_BIT_TEXT = {1: "true", 0: "false"}
+# Indexes for the lookups done by `get_membership_id`, `get_memberships` and `get_object_id`.
+_INDEX_QUERIES = (
+    f"CREATE INDEX IF NOT EXISTS ix_membership_lookup ON {Schema.Memberships.name}"
+    "(child_object_id, parent_object_id, collection_id)",
+    f"CREATE INDEX IF NOT EXISTS ix_object_name_class ON {Schema.Objects.name}(name, class_id)",
+)
+_INSERT_DATA_QUERY = f"INSERT INTO {Schema.Data.name}(membership_id, property_id, value) VALUES(?, ?, ?)"
 
 
 class PlexosSQLite:
@@ -23,26 +51,71 @@ class PlexosSQLite:
     Since we always start from a file XML, the default behaviour is to create an in-memory representation
     of the database. The usage is not to persist it into disk since the output file is always a XML, but it is
     possible by using the method `backup`.
+
+    Parameters
+    ----------
+    xml_fname
+        Path of the XML file used to populate the database.
+    xml_handler
+        Already parsed XML to populate the database. Used instead of `xml_fname`.
+    create_collations
+        Add the custom collations used by the schema.
+    page_size
+        SQLite page size in bytes, e.g., 8192 for insert-heavy workloads. It can only be set at creation,
+        so it is applied before the schema is created. Defaults to the SQLite default.
     """
 
     DB_FILENAME = "plexos.db"
     _conn: sqlite3.Connection
+    _QUERY_CACHE: dict[tuple[str, str], dict[tuple, int]]
+    _class_ids: dict[str, int] | None
+    _collections: dict[str, list[tuple[int, int, int]]] | None
+    _property_ids: dict[int, dict[str, int]]
+    _object_ids: dict[tuple[int, str], list[tuple[int, int]]] | None
 
     def __init__(
         self,
         xml_fname: str | None = None,
         xml_handler: XMLHandler | None = None,
         create_collations: bool = True,
+        page_size: int | None = None,
     ) -> None:
         super().__init__()
-        self._conn = sqlite3.connect(":memory:")
-        self._sqlite_config()
-        self._QUERY_CACHE: dict[tuple, int] = {}
+        self._setup(sqlite3.connect(":memory:"), create_collations=create_collations)
+        self._sqlite_config(page_size=page_size)
+        self._create_table_schema()
+        self._populate_database(xml_fname=xml_fname, xml_handler=xml_handler)
+
+    @classmethod
+    def from_conn(cls, conn: sqlite3.Connection, create_collations: bool = True) -> "PlexosSQLite":
+        """Return an instance that uses a connection with an already populated database.
+
+        Useful to wrap a copy of another database made with `sqlite3.Connection.backup`, which is much
+        faster than parsing the XML again.
+
+        Parameters
+        ----------
+        conn
+            Connection to a database with the plexos schema.
+        create_collations
+            Add the custom collations used by the schema. Collations are not copied with the database.
 
+        Note
+        ----
+            The pragmas of the connection are not modified. Unlike the database created by `__init__`, it
+            keeps the durability settings given by the caller.
+        """
+        instance = cls.__new__(cls)
+        instance._setup(conn, create_collations=create_collations)
+        return instance
+
+    def _setup(self, conn: sqlite3.Connection, create_collations: bool = True) -> None:
+        """Initialize the state of the instance for the given connection."""
+        self._conn = conn
+        self._transaction_depth = 0
+        self._clear_cache()
         if create_collations:
             self._create_collations()
-        self._create_table_schema()
-        self._populate_database(xml_fname=xml_fname, xml_handler=xml_handler)
 
     def add_attribute(
         self,
@@ -89,14 +162,9 @@ class PlexosSQLite:
         attribute_id = self._get_id(Schema.Attributes, attribute_name, class_name=attribute_class)
 
         params = (object_id, attribute_id, attribute_value)
-        placeholders = ", ".join("?" * len(params))
-        with self._conn as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                f"INSERT INTO {Schema.AttributeData.name}(object_id, attribute_id, value) "
-                f"VALUES({placeholders})",
-                params,
-            )
+            cursor.execute(_INSERT_ATTRIBUTE_DATA_QUERY, params)
             attribute_id = cursor.lastrowid  # type: ignore
         if attribute_id is None:
             raise TypeError("Could not fetch the last row of the insert. Check query format.")
@@ -125,27 +193,15 @@ class PlexosSQLite:
             If the database could not return the category_id from the connection.
         """
         class_id = self._get_id(Schema.Class, class_name.name)
-        rank_query = f"""
-        SELECT
-            max(rank)
-        FROM
-            {Schema.Categories.name}
-        WHERE
-            class_id = :class_id
-        """
-        existing_rank = self.query(
-            rank_query,
-            {"class_id": class_id},
-        )[0][0]
+        existing_rank = self.query(_CATEGORY_MAX_RANK_QUERY, {"class_id": class_id})[0][0]
 
         params = (class_id, existing_rank + 1, category_name)
 
-        with self._conn as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                f"INSERT INTO {Schema.Categories.name}(class_id, rank, name) VALUES(?, ?, ?)", params
-            )
+            cursor.execute(_INSERT_CATEGORY_QUERY, params)
             category_id = cursor.lastrowid
+        self._invalidate_id(Schema.Categories, category_name)
 
         if category_id is None:
             raise TypeError("Could not fetch the last row of the insert. Check query format.")
@@ -183,16 +239,11 @@ class PlexosSQLite:
         child_class_id = self._get_id(Schema.Class, child_class.name)
 
         # Check for child objects
-        parent_object_id = self._get_id(Schema.Objects, parent_object_name, class_name=parent_class)
-        child_object_id = self._get_id(
-            Schema.Objects, child_object_name, class_name=child_class, category_name=child_category
-        )
-        collection_id = self._get_id(
-            Schema.Collection,
-            collection.name,
-            parent_class_name=parent_class,
-            child_class_name=child_class,
+        parent_object_id = self.get_object_id(parent_object_name, class_name=parent_class)
+        child_object_id = self.get_object_id(
+            child_object_name, class_name=child_class, category_name=child_category
         )
+        collection_id = self.get_collection_id(collection, parent_class=parent_class, child_class=child_class)
 
         membership_id = self._add_membership(
             parent_object_id, child_object_id, parent_class_id, child_class_id, collection_id
@@ -200,6 +251,56 @@ class PlexosSQLite:
 
         return membership_id
 
+    def add_memberships(
+        self,
+        object_pairs: Sequence[tuple[str, str]],
+        /,
+        *,
+        parent_class: ClassEnum,
+        child_class: ClassEnum,
+        collection: CollectionEnum,
+    ) -> list[int]:
+        """Add memberships between multiple pairs of objects for a given collection.
+
+        Bulk version of `add_membership`. The classes and collection are resolved once and the memberships
+        are inserted with multi-row `INSERT ... RETURNING` statements in a single transaction.
+
+        Parameters
+        ----------
+        object_pairs
+            Sequence of (parent_object_name, child_object_name)
+        parent_class
+            Class of the parents
+        child_class
+            Class of the children
+        collection
+            Collection for memberships to be added.
+
+        Returns
+        -------
+        list[int]
+            membership_id of each pair in the same order as `object_pairs`.
+        """
+        parent_class_id = self.get_class_id(parent_class)
+        child_class_id = self.get_class_id(child_class)
+        collection_id = self.get_collection_id(collection, parent_class=parent_class, child_class=child_class)
+        rows = [
+            (
+                parent_class_id,
+                self.get_object_id(parent_object_name, class_name=parent_class),
+                child_class_id,
+                self.get_object_id(child_object_name, class_name=child_class),
+                collection_id,
+            )
+            for parent_object_name, child_object_name in object_pairs
+        ]
+
+        return self._insert_rows(
+            Schema.Memberships,
+            ("parent_class_id", "parent_object_id", "child_class_id", "child_object_id", "collection_id"),
+            rows,
+        )
+
     def _add_membership(
         self,
         parent_object: int,
@@ -208,16 +309,10 @@ class PlexosSQLite:
         child_class: int,
         collection: int,
     ) -> int:
-        membership_query = """
-        INSERT into
-            t_membership(parent_class_id, parent_object_id, child_class_id, child_object_id, collection_id)
-        values (?,?,?,?,?)
-        """
-
-        with self._conn as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                membership_query,
+                _INSERT_MEMBERSHIP_QUERY,
                 (parent_class, parent_object, child_class, child_object, collection),
             )
             membership_id = cursor.lastrowid
@@ -271,22 +366,11 @@ class PlexosSQLite:
             When the property is not a valid string for the collection.
         """
         parent_class = parent_class or ClassEnum.System
-        object_id = self.get_object_id(object_name, class_name=object_class)
-        valid_properties = self.get_valid_properties(
-            collection, child_class=object_class, parent_class=parent_class
-        )
-        if property_name not in valid_properties:
-            msg = (
-                f"Property {property_name} does not exist for collection: {collection}. "
-                f"Run `self.get_valid_properties({ collection }) to verify valid properties."
-            )
-            raise KeyError(msg)
         property_id = self.get_property_id(
             property_name, collection=collection, child_class=object_class, parent_class=parent_class
         )
-        assert object_id is not None
 
-        # Add system membership
+        # Add system membership. The membership lookup also validates that the object exists.
         parent_object_name = parent_object_name or SYSTEM_CLASS_NAME  # Default to system class
 
         membership_id = self.get_membership_id(
@@ -298,18 +382,17 @@ class PlexosSQLite:
         )
 
         sqlite_data = (membership_id, property_id, property_value)
-        with self._conn as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "INSERT into t_data(membership_id, property_id, value) values (?,?,?)", sqlite_data
-            )
+            cursor.execute(_INSERT_DATA_QUERY, sqlite_data)
             data_id = cursor.lastrowid
         assert data_id is not None
 
         # Enable proeprty if disabled.
-        with self._conn as conn:
-            conn.execute("UPDATE t_property set is_dynamic=1 where property_id = ?", (property_id,))
-            conn.execute("UPDATE t_property set is_enabled=1 where property_id = ?", (property_id,))
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE t_property set is_dynamic=1, is_enabled=1 where property_id = ?", (property_id,)
+            )
 
         # Add scenario tag if passed
         if scenario:
@@ -320,12 +403,8 @@ class PlexosSQLite:
 
         # Add text if passed
         if text:
-            text_sqlite = []
-            for key, value in text.items():
-                text_class_id = self.query("select class_id from t_class where name = ?", (key,))[0][0]
-                assert text_class_id
-                text_sqlite.append((text_class_id, data_id, value))
-            with self._conn as conn:
+            text_sqlite = [(self._get_id(Schema.Class, key), data_id, value) for key, value in text.items()]
+            with self._transaction() as conn:
                 conn.executemany("INSERT into t_text(class_id,data_id,value) VALUES(?,?,?)", text_sqlite)
 
         return data_id
@@ -340,15 +419,18 @@ class PlexosSQLite:
         collection: CollectionEnum,
         scenario: str,
         chunksize: int = 10_000,
-    ) -> None:
-        """Bulk insert multiple properties from a list of records."""
+    ) -> list[int]:
+        """Bulk insert multiple properties from a list of records.
+
+        Returns
+        -------
+        list[int]
+            data_id of the added properties.
+        """
         parent_object_id = self.get_object_id(parent_object_name, class_name=parent_class)
         collection_id = self.get_collection_id(collection, parent_class=parent_class)
-        collection_properties = self.query(
-            f"select name, property_id from t_property where collection_id={collection_id}"
-        )
-        property_ids = {key: value for key, value in collection_properties}
-        component_names = tuple(d["name"] for d in records)
+        property_ids = self._get_property_ids(collection_id)
+        component_names = tuple(dict.fromkeys(d["name"] for d in records))
         component_memberships_query = f"""
         SELECT
           t_object.name as name,
@@ -358,10 +440,12 @@ class PlexosSQLite:
         INNER JOIN
             t_object on t_membership.child_object_id = t_object.object_id
         WHERE
-          t_membership.parent_object_id = {parent_object_id} AND
+          t_membership.parent_object_id = ? AND
           t_object.name in ({", ".join(["?" for _ in range(len(component_names))])})
         """
-        component_memberships = self.query(component_memberships_query, params=component_names)
+        component_memberships = self.query(
+            component_memberships_query, params=(parent_object_id, *component_names)
+        )
         component_memberships_dict: dict = {key: value for key, value in component_memberships}
 
         if not component_memberships:
@@ -370,51 +454,27 @@ class PlexosSQLite:
                 "Make sure you use `add_object` before adding properties."
             )
 
-        sqlite_data = self._properties_to_sql_ingest(records, component_memberships_dict, property_ids)
-        # Make properties dynamic on plexos
-        with self._conn as conn:
-            filter_property_ids = [d[1] for d in sqlite_data]
-            for property_id in filter_property_ids:
-                conn.execute("UPDATE t_property set is_dynamic=1 where property_id = ?", (property_id,))
-                conn.execute("UPDATE t_property set is_enabled=1 where property_id = ?", (property_id,))
-
-        with self._conn as conn:
-            cursor = conn.cursor()
-            cursor.executemany(
-                "INSERT into t_data(membership_id, property_id, value) values (?,?,?)", sqlite_data
+        sqlite_data, used_property_ids = self._properties_to_sql_ingest(
+            records, component_memberships_dict, property_ids
+        )
+        # Everything is committed once at the end.
+        with self._bulk_mode(), self._transaction() as conn:
+            # Make properties dynamic on plexos
+            filter_property_ids = tuple(used_property_ids)
+            conn.execute(
+                "UPDATE t_property set is_dynamic=1, is_enabled=1 "
+                f"where property_id in ({', '.join('?' * len(filter_property_ids))})",
+                filter_property_ids,
             )
 
-        scenario_id = self.get_scenario_id(scenario_name=scenario)
-        for batch in batched(sqlite_data, chunksize):
-            place_holders = ", ".join(["(?, ?, ?)"] * len(batch))
-            scenario_query = f"""
-                INSERT into t_tag(data_id, object_id)
-                SELECT
-                    data_id as data_id,
-                    {scenario_id} as object_id
-                FROM
-                  t_data
-                WHERE (membership_id, property_id, value) in ({place_holders});
-            """
-            params = [data for row in batch for data in row]
-            self.execute_query(scenario_query, params=params)
-
-            data_ids_query = f"""
-                SELECT
-                  t_data.data_id,
-                  t_data.property_id,
-                  t_property.name as property_name,
-                  t_data.value,
-                  t_membership.membership_id,
-                  t_membership.child_object_id
-                FROM
-                  t_data
-                inner join t_property on t_data.property_id = t_property.property_id
-                inner join t_membership on t_data.membership_id = t_membership.membership_id
-                WHERE (t_membership.membership_id, t_data.property_id, value) in ({place_holders});
-                """
-            _ = self.query(data_ids_query, params=params)
-        return
+            data_ids = self._insert_data(sqlite_data, chunksize=chunksize)
+
+            scenario_id = self.get_scenario_id(scenario_name=scenario)
+            conn.executemany(
+                "INSERT into t_tag(data_id, object_id) values (?,?)",
+                ((data_id, scenario_id) for data_id in data_ids),
+            )
+        return data_ids
 
     def add_object(
         self,
@@ -456,24 +516,21 @@ class PlexosSQLite:
         int
             object_id
         """
-        category_check = self.check_id_exists(Schema.Categories, category_name, class_name=class_name)
-        if not category_check:
-            category_id = self.add_category(category_name, class_name=class_name)
-        else:
+        try:
             category_id = self.get_category_id(category_name, class_name=class_name)
+        except KeyError:
+            category_id = self.add_category(category_name, class_name=class_name)
 
         class_id = self._get_id(Schema.Class, class_name.name)
 
         params = (object_name, class_id, category_id, str(uuid.uuid4()), description)
-        placeholders = ", ".join("?" * len(params))
-        with self._conn as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                f"INSERT INTO {Schema.Objects.name}(name, class_id, category_id, GUID, description) "
-                f"VALUES({placeholders})",
-                params,
-            )
+            cursor.execute(_INSERT_OBJECT_QUERY, params)
             object_id = cursor.lastrowid
+        self._invalidate_id(Schema.Objects, object_name)
+        if object_id is not None:
+            self._index_object(class_id, object_name, object_id, category_id)
 
         if object_id is None:
             raise TypeError("Could not fetch the last row of the insert. Check query format.")
@@ -489,6 +546,74 @@ class PlexosSQLite:
         )
         return object_id
 
+    def add_objects(
+        self,
+        object_names: Sequence[str],
+        class_name: ClassEnum,
+        collection_name: CollectionEnum,
+        /,
+        *,
+        category_name: str = "-",
+        description: str | None = None,
+    ) -> list[int]:
+        """Add multiple objects of the same class to the database with their system memberships.
+
+        Bulk version of `add_object`. The category, class and collection are resolved once and all the
+        objects and memberships are inserted with a single statement each.
+
+        Parameters
+        ----------
+        object_names
+            Names of the objects to be added
+        class_name
+            ClassEnum from the objects to be added. E.g., for generators class_name=ClassEnum.Generator
+        collection_name
+            Collection for system membership. E.g., for generators collection_name=CollectionEnum.Generators
+        category_name
+            Category of all the objects.
+        description
+            Description of all the objects.
+
+        Raises
+        ------
+        sqlite.IntegrityError
+            if an object is inserted without a unique name/class pair
+
+        Returns
+        -------
+        list[int]
+            object_id of each object in the same order as `object_names`.
+        """
+        try:
+            category_id = self.get_category_id(category_name, class_name=class_name)
+        except KeyError:
+            category_id = self.add_category(category_name, class_name=class_name)
+
+        class_id = self._get_id(Schema.Class, class_name.name)
+        system_class_id = self._get_id(Schema.Class, ClassEnum.System.name)
+        system_object_id = self.get_object_id(SYSTEM_CLASS_NAME, class_name=ClassEnum.System)
+        collection_id = self.get_collection_id(
+            collection_name, parent_class=ClassEnum.System, child_class=class_name
+        )
+
+        with self._transaction() as conn:
+            object_ids = self._insert_rows(
+                Schema.Objects,
+                ("name", "class_id", "category_id", "GUID", "description"),
+                [(name, class_id, category_id, str(uuid.uuid4()), description) for name in object_names],
+            )
+            conn.executemany(
+                _INSERT_MEMBERSHIP_QUERY,
+                [
+                    (system_class_id, system_object_id, class_id, object_id, collection_id)
+                    for object_id in object_ids
+                ],
+            )
+        for name, object_id in zip(object_names, object_ids):
+            self._invalidate_id(Schema.Objects, name)
+            self._index_object(class_id, name, object_id, category_id)
+        return object_ids
+
     def add_report(  # noqa: D102
         self,
         /,
@@ -507,18 +632,17 @@ class PlexosSQLite:
     ) -> None:
         object_id = self.get_object_id(object_name, class_name=ClassEnum.Report)
         collection_id = self.get_collection_id(collection, parent_class=parent_class, child_class=child_class)
-        query_string = "SELECT name from t_property_report where collection_id = ?"
-        valid_properties = [d[0] for d in self.query(query_string, (collection_id,))]
-        if property not in valid_properties:
+        result = self.fetchone(
+            "select property_id from t_property_report where collection_id = ? and name = ?",
+            (collection_id, property),
+        )
+        if result is None:
             msg = (
                 f"Property {property} does not exist for collection: {collection}. "
                 "Check valid properties for the report type."
             )
             raise KeyError(msg)
-        property_id = self.query(
-            "select property_id from t_property_report where collection_id = ? and name = ?",
-            (collection_id, property),
-        )[0][0]
+        property_id = result[0]
 
         report_query = """
         INSERT INTO
@@ -594,9 +718,49 @@ class PlexosSQLite:
         ValueError
             If multiple IDs are returned for the given parent/child class provided.
         """
-        return self._get_id(
-            Schema.Collection, collection.name, parent_class_name=parent_class, child_class_name=child_class
-        )
+        return self._get_collection_id(collection.name, parent_class=parent_class, child_class=child_class)
+
+    def _get_collection_id(
+        self,
+        collection_name: str,
+        parent_class: ClassEnum | None = None,
+        child_class: ClassEnum | None = None,
+    ) -> int:
+        """Return the ID for a given collection name from the in-memory collection snapshot."""
+        if self._collections is None:
+            rows = self.query(
+                f"SELECT name, collection_id, parent_class_id, child_class_id FROM {Schema.Collection.name}"
+            )
+            collections: dict[str, list[tuple[int, int, int]]] = {}
+            for name, collection_id, parent_class_id, child_class_id in rows:
+                if name:
+                    # Match the NOSPACE collation of `t_collection.name`
+                    collections.setdefault(name.replace(" ", ""), []).append(
+                        (collection_id, parent_class_id, child_class_id)
+                    )
+            self._collections = collections
+
+        parent_class_id = self.get_class_id(parent_class) if parent_class is not None else None
+        child_class_id = self.get_class_id(child_class) if child_class is not None else None
+        collection_ids = [
+            collection_id
+            for collection_id, collection_parent_id, collection_child_id in self._collections.get(
+                collection_name.replace(" ", ""), []
+            )
+            if (parent_class_id is None or collection_parent_id == parent_class_id)
+            and (child_class_id is None or collection_child_id == child_class_id)
+        ]
+
+        if not collection_ids:
+            msg = (
+                f"No collection found with the requested {collection_name=}, {parent_class=}, {child_class=}"
+            )
+            raise KeyError(msg)
+
+        if len(collection_ids) > 1:
+            msg = f"Multiple ids returned for {collection_name}. Try passing addtional filters"
+            raise ValueError(msg)
+        return collection_ids[0]
 
     def get_category_max_id(self, class_enum: ClassEnum) -> int:
         """Return the current max rank for a given category."""
@@ -613,27 +777,39 @@ class PlexosSQLite:
         """
         return self.query(query, params={"class_id": class_id})[0][0]
 
-    def get_class_id(self, class_enum: ClassEnum) -> int:
+    def get_class_id(self, class_enum: ClassEnum | str) -> int:
         """Return the ID for a given class.
 
         Parameters
         ----------
-        class_name : ClassEnum
-            The enum collection from which to retrieve the ID.
+        class_enum : ClassEnum | str
+            Class, or name of the class, to retrieve the ID. Spaces on the name are ignored.
 
         Returns
         -------
         int
-            The ID corresponding to the object, or None if not found.
+            The ID corresponding to the class.
 
         Raises
         ------
         KeyError
-            If ID does not exists on the database.
-        ValueError
-            If multiple IDs are returned for the given class.
+            If the class does not exist on the in-memory snapshot.
+
+        Note
+        ----
+            Unlike `get_object_id`, there is no fallback to the database. Classes inserted outside
+            `ingest_from_records` are not picked up until the cache is cleared.
         """
-        return self._get_id(Schema.Class, class_enum.name)
+        if self._class_ids is None:
+            result = self.query(f"SELECT name, class_id FROM {Schema.Class.name}")
+            # Match the NOSPACE collation of `t_class.name`
+            self._class_ids = {name.replace(" ", ""): class_id for name, class_id in result if name}
+
+        class_id = self._class_ids.get(class_enum.replace(" ", ""))
+        if class_id is None:
+            msg = f"No class found with the requested {class_enum=}"
+            raise KeyError(msg)
+        return class_id
 
     def get_property_id(
         self,
@@ -667,31 +843,27 @@ class PlexosSQLite:
         ValueError
             If multiple IDs are returned for the given parent/child class provided.
         """
-        valid_properties = self.get_valid_properties(
-            collection, parent_class=parent_class, child_class=child_class
-        )
-        if property_name not in valid_properties:
+        collection_id = self.get_collection_id(collection, parent_class=parent_class, child_class=child_class)
+        property_id = self._get_property_ids(collection_id).get(property_name)
+        if property_id is None:
             msg = (
                 f"Property {property_name} does not exist for collection: {collection}. "
                 f"Run `self.get_valid_properties({ collection }) to verify valid properties."
             )
             raise KeyError(msg)
+        return property_id
 
-        collection_id = self.get_collection_id(collection, parent_class=parent_class, child_class=child_class)
-
-        query_id = """
-        SELECT
-            property_id
-        FROM `t_property`
-        WHERE
-            name = :property_name
-        AND
-            collection_id = :collection_id
-        """
-        params = {"property_name": property_name, "collection_id": collection_id}
-        result = self.query(query_id, params)
-
-        return result[0][0]  # Get first element of tuple
+    def _get_property_ids(self, collection_id: int) -> dict[str, int]:
+        """Return the mapping of property name to property_id for a given collection."""
+        if collection_id not in self._property_ids:
+            result = self.query(
+                "SELECT name, property_id from t_property where collection_id = ?", (collection_id,)
+            )
+            property_ids: dict[str, int] = {}
+            for name, property_id in result:
+                property_ids.setdefault(name, property_id)
+            self._property_ids[collection_id] = property_ids
+        return self._property_ids[collection_id]
 
     def get_object_id(self, object_name: str, class_name: ClassEnum, category_name: str | None = None) -> int:
         """Return the ID for a given object.
@@ -717,8 +889,38 @@ class PlexosSQLite:
         ValueError
             If multiple IDs are returned for the given object.
         """
+        class_id = self.get_class_id(class_name)
+        object_ids = self._get_object_ids().get((class_id, nocase(object_name)), [])
+        if category_name:
+            category_id = self.get_category_id(category_name, class_name=class_name)
+            object_ids = [
+                (object_id, object_category)
+                for object_id, object_category in object_ids
+                if object_category == category_id
+            ]
+        if len(object_ids) == 1:
+            return object_ids[0][0]
+
+        # Not in memory, fallback to the database.
         return self._get_id(Schema.Objects, object_name, class_name=class_name, category_name=category_name)
 
+    def _get_object_ids(self) -> dict[tuple[int, str], list[tuple[int, int]]]:
+        """Return the (object_id, category_id) of the objects by class_id and case folded name."""
+        if self._object_ids is None:
+            self._object_ids = {}
+            query = f"SELECT class_id, name, object_id, category_id FROM {Schema.Objects.name}"
+            for class_id, object_name, object_id, category_id in self.query(query):
+                if object_name is not None:
+                    self._index_object(class_id, object_name, object_id, category_id)
+        return self._object_ids
+
+    def _index_object(self, class_id: int, object_name: str, object_id: int, category_id: int) -> None:
+        """Add an object to the in-memory index if it is loaded."""
+        if self._object_ids is None:
+            return
+        # Match the NOCASE collation of `t_object.name`
+        self._object_ids.setdefault((class_id, nocase(object_name)), []).append((object_id, category_id))
+
     def check_id_exists(
         self, table: Schema, object_name: str, /, *, class_name: ClassEnum | None = None
     ) -> bool:
@@ -796,16 +998,23 @@ class PlexosSQLite:
             If multiple IDs are returned for the given filters.
 
         """
+        if table is Schema.Class and not any(
+            (class_name, collection_name, parent_class_name, child_class_name, category_name)
+        ):
+            return self.get_class_id(object_name)
+
         table_name = table.name
         column_name = table.label
         params = {
             "object_name": object_name,
         }
 
-        # tuple that should be unique for any id returned
-        query_key = (table.name, object_name, class_name, parent_class_name, child_class_name)
-        if query_key in self._QUERY_CACHE:
-            return self._QUERY_CACHE[query_key]
+        # Ids are cached by table and name, and then by the tuple of filters that should make them unique.
+        name_key = self._cache_key(table, object_name)
+        query_key = (class_name, collection_name, parent_class_name, child_class_name, category_name)
+        cached_ids = self._QUERY_CACHE.get(name_key, {})
+        if query_key in cached_ids:
+            return cached_ids[query_key]
 
         query = f"SELECT {column_name} FROM `{table_name}`"
         conditions = []
@@ -861,7 +1070,7 @@ class PlexosSQLite:
 
         ret: int = result[0][0]  # Get first element of tuple
 
-        self._QUERY_CACHE[query_key] = ret
+        self._QUERY_CACHE.setdefault(name_key, {})[query_key] = ret
 
         return ret
 
@@ -902,40 +1111,52 @@ class PlexosSQLite:
         ValueError
             If multiple IDs are returned for the given parent/child class provided.
         """
-        # Get all the ids
-        child_class_id = self._get_id(Schema.Class, child_class.name)
-        parent_class_id = self._get_id(Schema.Class, parent_class.name)
-        child_object_id = self.get_object_id(child_name, class_name=child_class)
-        parent_object_id = self.get_object_id(parent_name, class_name=parent_class)
-        collection_id = self.get_collection_id(collection, child_class=child_class, parent_class=parent_class)
-
+        # Class ids are kept in memory, so the rest of the ids are resolved in a single query.
         query_id = """
         SELECT
-            membership_id
+            mem.membership_id
         FROM
-            t_membership
+            t_membership AS mem
+        INNER JOIN
+            t_object AS child_object ON child_object.object_id = mem.child_object_id
+        INNER JOIN
+            t_object AS parent_object ON parent_object.object_id = mem.parent_object_id
+        INNER JOIN
+            t_collection AS collection ON collection.collection_id = mem.collection_id
         WHERE
-            child_object_id = :child_object_id
+            mem.child_class_id = :child_class_id
+        AND
+            mem.parent_class_id = :parent_class_id
+        AND
+            child_object.class_id = :child_class_id
+        AND
+            child_object.name = :child_name
         AND
-            parent_object_id = :parent_object_id
+            parent_object.class_id = :parent_class_id
         AND
-            parent_class_id = :parent_class_id
+            parent_object.name = :parent_name
         AND
-            child_class_id = :child_class_id
+            collection.parent_class_id = :parent_class_id
         AND
-            collection_id = :collection_id
+            collection.child_class_id = :child_class_id
+        AND
+            collection.name = :collection_name
         """
         params = {
-            "child_object_id": child_object_id,
-            "parent_object_id": parent_object_id,
-            "collection_id": collection_id,
-            "child_class_id": child_class_id,
-            "parent_class_id": parent_class_id,
+            "child_name": child_name,
+            "parent_name": parent_name,
+            "collection_name": collection.name,
+            "child_class_id": self.get_class_id(child_class),
+            "parent_class_id": self.get_class_id(parent_class),
         }
         result = self.query(query_id, params)
 
         if not result:
-            msg = f"No object found with the requested {params=}"
+            # Raise the specific error if any of the objects or the collection does not exist.
+            _ = self.get_object_id(child_name, class_name=child_class)
+            _ = self.get_object_id(parent_name, class_name=parent_class)
+            _ = self.get_collection_id(collection, child_class=child_class, parent_class=parent_class)
+            msg = f"No membership found with the requested {params=}"
             raise KeyError(msg)
 
         if len(result) > 1:
@@ -1034,10 +1255,9 @@ class PlexosSQLite:
 
     def get_scenario_id(self, scenario_name: str) -> int:
         """Return scenario id for a given scenario name."""
-        scenario_id = self.check_id_exists(Schema.Objects, scenario_name, class_name=ClassEnum.Scenario)
-        if not scenario_id:
-            scenario_id = self.add_object(scenario_name, ClassEnum.Scenario, CollectionEnum.Scenarios)
-        return scenario_id
+        if not self.check_id_exists(Schema.Objects, scenario_name, class_name=ClassEnum.Scenario):
+            return self.add_object(scenario_name, ClassEnum.Scenario, CollectionEnum.Scenarios)
+        return self.get_object_id(scenario_name, class_name=ClassEnum.Scenario)
 
     def get_valid_properties(
         self,
@@ -1047,13 +1267,11 @@ class PlexosSQLite:
     ) -> list[str]:
         """Return list of valid property names per collection."""
         collection_id = self.get_collection_id(collection, parent_class=parent_class, child_class=child_class)
-        query_string = "SELECT name from t_property where collection_id = ?"
-        result = self.query(query_string, (collection_id,))
-        return [d[0] for d in result]
+        return list(self._get_property_ids(collection_id))
 
     def execute_query(self, query: str, params=None) -> None:
         """Execute of insert query to the database."""
-        with self._conn as conn:
+        with self._transaction() as conn:
             _ = conn.execute(query, params) if params else conn.execute(query)
         return
 
@@ -1077,35 +1295,60 @@ class PlexosSQLite:
 
             This function could be slow depending the complexity of the query passed.
         """
-        with self._conn as conn:
+        with self._transaction() as conn:
             res = conn.execute(query_string, params) if params else conn.execute(query_string)
         ret = res.fetchall()
 
         return ret
 
-    def ingest_from_records(self, tag: str, record_data: Sequence):
-        """Insert elements from xml to database."""
+    def fetchone(self, query_string: str, params=None) -> tuple | None:
+        """Execute of query to the database and return only the first row.
+
+        Parameters
+        ----------
+        query
+            String to get passed to the database connector.
+        params
+            Tuple or dict for passing
+
+        Returns
+        -------
+        tuple or None
+            First row of the result, or None if the query did not return rows.
+        """
+        with self._transaction() as conn:
+            res = conn.execute(query_string, params) if params else conn.execute(query_string)
+        return res.fetchone()
+
+    def ingest_from_records(self, tag: str, record_data: Sequence, chunksize: int = 500):
+        """Insert elements from xml to database.
+
+        Consecutive records with the same columns are inserted with multi-row `INSERT ... VALUES` statements
+        of up to `chunksize` rows, which is faster than inserting them one by one.
+        """
         logger.trace("Ingesting {}", tag)
-        for record in record_data:
-            # Add backticks so we can insert table names with protected names on SQL.
-            # This is just to enable column names like "default", but also adds compatibility with MySQL
-            columns = ", ".join([f"`{key}`" for key in record.keys()])
-            str_replacement = ", ".join([f":{s}" for s in record.keys()])
-
-            # We use SQLite string replcement to pass a dictionary to the insert query.
-            # The format is "insert into `table`(column) values(:column)"
-            ingestion_sql = f"insert into {tag} ({columns}) values({str_replacement})"
-            logger.trace(ingestion_sql)
-
-            # NOTE: We might want to have additional error checking at some point.
-            # This should work for the mean time
-            try:
-                with self._conn as conn:
-                    conn.execute(ingestion_sql, record)
-            except sqlite3.Error as err:
-                raise err
-
-            logger.trace("Finished ingesting {}", tag)
+        if tag in (Schema.Class.name, Schema.Collection.name, Schema.Property.name, Schema.Objects.name):
+            self._clear_cache()
+        max_variables = self._conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        with self._transaction() as conn:
+            for columns_key, records in groupby(record_data, key=lambda record: tuple(record.keys())):
+                # Add backticks so we can insert table names with protected names on SQL.
+                # This is just to enable column names like "default", but also adds compatibility with
+                # MySQL
+                columns = ", ".join([f"`{key}`" for key in columns_key])
+                row_placeholder = f"({', '.join(['?'] * len(columns_key))})"
+                logger.trace("insert into {} ({}) values {}", tag, columns, row_placeholder)
+
+                # NOTE: We might want to have additional error checking at some point.
+                # This should work for the mean time
+                for batch in batched(records, min(chunksize, max_variables // len(columns_key))):
+                    place_holders = ", ".join([row_placeholder] * len(batch))
+                    conn.execute(
+                        f"insert into {tag} ({columns}) values {place_holders}",
+                        [value for record in batch for value in record.values()],
+                    )
+
+        logger.trace("Finished ingesting {}", tag)
         return
 
     def save(self, fpath: Path | str):
@@ -1130,7 +1373,7 @@ class PlexosSQLite:
             Plexos MasterDataSet URI
 
         """
-        with self._conn as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
             tables = cursor.fetchall()
@@ -1150,8 +1393,8 @@ class PlexosSQLite:
                 if not rows:
                     continue
 
-                column_types_tuple = self.query(f"SELECT name, type from pragma_table_info('{table_name}');")
-                column_types: dict[str, str] = {key: value for key, value in column_types_tuple}
+                cursor.execute("SELECT name, type FROM pragma_table_info(?)", (table_name,))
+                column_types: dict[str, str] = dict(cursor.fetchall())
 
                 # Create XML elements for the table
                 self._create_table_element(root, column_types=column_types, table_name=table_name, rows=rows)
@@ -1176,56 +1419,198 @@ class PlexosSQLite:
 
     def _create_table_element(self, root, column_types: dict[str, str], table_name: str, rows: list[tuple]):
         """Create XML elements for a table."""
+        # Loop invariants are bound once since this runs for every cell of the database. The conversion to
+        # text is resolved per column instead of per cell.
+        sub_element = ET.SubElement
+        converters: list[tuple[str, Callable[[Any], str | None]]] = [
+            (column_name, _BIT_TEXT.get if column_type == "BIT" else str)
+            for column_name, column_type in column_types.items()
+        ]
         for row in rows:
-            table_element = ET.SubElement(root, table_name)
-            for (column_name, column_type), column_value in zip(column_types.items(), row):
+            table_element = sub_element(root, table_name)
+            for (column_name, convert), column_value in zip(converters, row):
                 if column_value is None:
                     continue
-                column_element = ET.SubElement(table_element, column_name)
-                match column_type:
-                    case "BIT":
-                        match column_value:
-                            case 1:
-                                column_element.text = "true"
-                            case 0:
-                                column_element.text = "false"
-                    case _:
-                        column_element.text = str(column_value)
+                sub_element(table_element, column_name).text = convert(column_value)
 
     def _fetch_table_data(self, cursor, table_name):
         """Fetch data from a table."""
         cursor.execute(f"SELECT * FROM {table_name}")
         return cursor.fetchall()
 
-    def _sqlite_config(self):
+    def _clear_cache(self) -> None:
+        """Drop the ids that are kept in memory to avoid querying the database.
+
+        Classes, collections and objects are each loaded with a single query on their first lookup, and the
+        properties of a collection on the first lookup of that collection. They stay in memory until this is
+        called again.
+        """
+        self._QUERY_CACHE = {}
+        self._class_ids = None
+        self._collections = None
+        self._property_ids = {}
+        self._object_ids = None
+
+    def _invalidate_id(self, table: Schema, name: str) -> None:
+        """Drop the cached ids for a name that was just added to the table.
+
+        A new row can make a lookup with fewer filters ambiguous, so all the cached lookups for the name are
+        dropped.
+        """
+        self._QUERY_CACHE.pop(self._cache_key(table, name), None)
+
+    @staticmethod
+    def _cache_key(table: Schema, name) -> tuple[str, str]:
+        """Return the key of a name on the id cache.
+
+        Only `t_object.name` uses the NOCASE collation, names of other tables are matched exactly.
+        """
+        name = str(name)
+        return (table.name, nocase(name) if table is Schema.Objects else name)
+
+    def _sqlite_config(self, page_size: int | None = None):
         """Call all sqlite configuration prior schema creation."""
-        with self._conn as conn:
+        with self._transaction() as conn:
+            if page_size is not None:
+                # Only has effect before the first table is created.
+                conn.execute(f"PRAGMA page_size = {int(page_size)}")
             conn.execute("PRAGMA synchronous = OFF")  # Make it asynchronous
             conn.execute("PRAGMA journal_mode = OFF")  # Make it asynchronous
+            conn.execute("PRAGMA temp_store = MEMORY")  # Keep temporary tables off disk
+
+    @contextmanager
+    def bulk_writes(self) -> Iterator[None]:
+        """Group all the writes inside the block in a single transaction.
+
+        Every `add_*` method commits its own transaction. Wrapping several calls on this context manager
+        defers the commit to the end of the block.
+
+        Note
+        ----
+            The database runs with `journal_mode = OFF`, so writes done before an exception are not rolled
+            back. The ids kept in memory are dropped on an exception either way.
+
+        Examples
+        --------
+        >>> with db.bulk_writes():
+        ...     for generator_name in generators:
+        ...         db.add_object(generator_name, ClassEnum.Generator, CollectionEnum.Generators)
+        ...         db.add_property(
+        ...             generator_name,
+        ...             "Max Capacity",
+        ...             100,
+        ...             object_class=ClassEnum.Generator,
+        ...             collection=CollectionEnum.Generators,
+        ...         )
+        """
+        with self._transaction():
+            yield
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Return the connection inside a transaction that is only committed by the outermost caller."""
+        self._transaction_depth += 1
+        try:
+            if self._transaction_depth > 1:
+                yield self._conn
+            else:
+                try:
+                    with self._conn as conn:
+                        yield conn
+                except Exception:
+                    # The rolled back rows can still be referenced by the ids kept in memory.
+                    self._clear_cache()
+                    raise
+        finally:
+            self._transaction_depth -= 1
+
+    @contextmanager
+    def _bulk_mode(self, cache_size: int = -200_000) -> Iterator[None]:
+        """Tune the page cache for bulk inserts and restore the previous values on exit.
+
+        The cache is enlarged and spilling is disabled so dirty pages are not flushed in the middle of the
+        transaction. Durability pragmas are already disabled on `_sqlite_config` for the in-memory database.
+        """
+        pragmas = {"cache_size": int(cache_size), "cache_spill": 0}
+        previous = {pragma: self._conn.execute(f"PRAGMA {pragma}").fetchone()[0] for pragma in pragmas}
+        for pragma, value in pragmas.items():
+            self._conn.execute(f"PRAGMA {pragma} = {value}")
+        try:
+            yield
+        finally:
+            for pragma, value in previous.items():
+                self._conn.execute(f"PRAGMA {pragma} = {int(value)}")
 
     def _properties_to_sql_ingest(
         self, component_properties: list[dict], memberships: dict, property_ids: dict
-    ) -> list[tuple[int, int, Any]]:
-        """Convert a list of properties into a list of tuples with memberships for SQL ingestion."""
-        data = component_properties.copy()
+    ) -> tuple[list[tuple[int, int, Any]], set[int]]:
+        """Convert a list of properties into a list of tuples with memberships for SQL ingestion.
+
+        Returns the tuples for ingestion and the set of property ids used, so records are only walked once.
+        """
         result = []
-        for component in data:
-            name = component.pop("name")
-            membership_id = memberships[name]
+        used_property_ids = set()
+        for component in component_properties:
+            membership_id = memberships[component["name"]]
             # Iterate through each key-value pair in the dictionary
             for key, value in component.items():
                 property_id = property_ids.get(key, None)
-                if property_id is not None:
+                if key != "name" and property_id is not None:
                     result.append((membership_id, property_id, value))
-        return result
+                    used_property_ids.add(property_id)
+        return result, used_property_ids
+
+    def _insert_data(self, sqlite_data: list[tuple[int, int, Any]], chunksize: int = 10_000) -> list[int]:
+        """Insert (membership_id, property_id, value) rows into `t_data` and return their data_id."""
+        return self._insert_rows(
+            Schema.Data, ("membership_id", "property_id", "value"), sqlite_data, chunksize
+        )
+
+    def _insert_rows(
+        self, table: Schema, columns: tuple[str, ...], rows: Sequence[tuple], chunksize: int = 10_000
+    ) -> list[int]:
+        """Insert rows into a table and return their ids in insertion order.
+
+        Rows are inserted with one multi-row `INSERT ... RETURNING` statement per chunk. The chunk size is
+        capped by the maximum number of variables that the SQLite connection can bind. For SQLite versions
+        without `RETURNING`, the new ids are the ones greater than the max id before the insert.
+        """
+        table_name, id_column = table.name, table.label
+        row_placeholder = f"({', '.join(['?'] * len(columns))})"
+        insert_query = f"INSERT INTO {table_name}({', '.join(columns)}) VALUES "
+
+        if not SUPPORTS_RETURNING:
+            with self._transaction() as conn:
+                last_id = conn.execute(f"SELECT IFNULL(max({id_column}), 0) FROM {table_name}").fetchone()[0]
+                conn.executemany(insert_query + row_placeholder, rows)
+                # New rows get increasing ids on insertion order.
+                result = conn.execute(
+                    f"SELECT {id_column} FROM {table_name} WHERE {id_column} > ? ORDER BY {id_column}",
+                    (last_id,),
+                ).fetchall()
+            return [d[0] for d in result]
+
+        max_rows = self._conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER) // len(columns)
+        ids = []
+        with self._transaction() as conn:
+            for batch in batched(rows, min(chunksize, max_rows)):
+                place_holders = ", ".join([row_placeholder] * len(batch))
+                result = conn.execute(
+                    f"{insert_query}{place_holders} RETURNING {id_column}",
+                    [value for row in batch for value in row],
+                ).fetchall()
+                # RETURNING does not guarantee the order of the rows, but ids are assigned in insertion order.
+                ids.extend(sorted(d[0] for d in result))
+        return ids
 
     def _create_table_schema(self) -> None:
-        fpath = files("plexosdb").joinpath("schema.sql")
-        logger.debug("Using {} for creating plexos schema.", fpath)
+        logger.debug("Using {} for creating plexos schema.", files("plexosdb").joinpath(SCHEMA_FNAME))
 
-        with self._conn as conn:
-            conn.executescript(fpath.read_text(encoding="utf-8-sig"))
-        logger.trace("Schema created successfully", fpath)
+        with self._transaction() as conn:
+            conn.executescript(get_sql_query(SCHEMA_FNAME))
+            for index_query in _INDEX_QUERIES:
+                conn.execute(index_query)
+        logger.trace("Schema created successfully")
         return None
 
     def _populate_database(self, xml_fname: str | None, xml_handler: XMLHandler | None = None):
@@ -1240,13 +1625,14 @@ class PlexosSQLite:
         if not xml_handler:
             xml_handler = XMLHandler.parse(fpath=fpath)  # type: ignore
 
-        # Start data ingestion to the datbase
+        # Start data ingestion to the datbase. All the tags are committed at once.
         xml_tags = set([e.tag for e in xml_handler.root])  # Extract set of valid tags from xml
-        for tag in xml_tags:
-            schema = str2enum(tag)
-            if schema:
-                record_dict = xml_handler.get_records(schema)
-                self.ingest_from_records(tag, record_dict)
+        with self.bulk_writes():
+            for tag in xml_tags:
+                schema = str2enum(tag)
+                if schema:
+                    record_dict = xml_handler.get_records(schema)
+                    self.ingest_from_records(tag, record_dict)
 
     def _create_collations(self) -> None:
         """Add collate function for helping search enums."""
@@ -1,19 +1,41 @@
 """Util functions for plexosdb."""
 
 import ast
+import string
+import sys
+from functools import cache
+from importlib.resources import files
 from itertools import islice
 from typing import Any
 
 from loguru import logger
 
 
-def batched(iterable, n):
-    """Implement batched iterator.
+if sys.version_info >= (3, 12):
+    from itertools import batched
+else:
 
-    https://docs.python.org/3/library/itertools.html#itertools.batched
+    def batched(iterable, n):
+        """Implement batched iterator.
+
+        https://docs.python.org/3/library/itertools.html#itertools.batched
+        """
+        it = iter(iterable)
+        return iter(lambda: tuple(islice(it, n)), ())
+
+
+@cache
+def get_sql_query(fname: str) -> str:
+    """Return the content of a SQL file shipped with the package.
+
+    The files do not change at runtime, so each one is only read once.
+
+    Parameters
+    ----------
+    fname
+        Path of the SQL file relative to the package, e.g., "schema.sql".
     """
-    it = iter(iterable)
-    return iter(lambda: tuple(islice(it, n)), ())
+    return files("plexosdb").joinpath(fname).read_text(encoding="utf-8-sig")
 
 
 def validate_string(value: str) -> Any:
@@ -53,6 +75,14 @@ def validate_string(value: str) -> Any:
         return value
 
 
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def nocase(name: str) -> str:
+    """Fold a name like the NOCASE collation of SQLite, which only lower-cases the ASCII letters."""
+    return name.translate(_ASCII_LOWER)
+
+
 def no_space(a: str, b: str) -> int:
     """Collate function for catching strings with spaces."""
     if a.replace(" ", "") == b.replace(" ", ""):
@@ -4,6 +4,7 @@ import xml.etree.ElementTree as ET  # noqa: N817
 from collections import defaultdict
 from collections.abc import Iterable, Iterator
 from os import PathLike
+from typing import Any
 
 from loguru import logger
 
@@ -58,11 +59,23 @@ class XMLHandler:
             rename_dict = {}
         element_list = self.iter(element_enum, *elements, **tag_elements)
 
+        # Cell values repeat a lot across records (ids, flags, units), so each distinct string is only
+        # normalized once. Mutable results from `literal_eval` are not shared between records.
+        values: dict[str | None, Any] = {}
+
+        def _normalize(text: str | None) -> Any:
+            if text in values:
+                return values[text]
+            value = validate_string(text)  # type: ignore
+            if isinstance(value, str | int | float | None):
+                values[text] = value
+            return value
+
         # Return a dict version of the elements
         return list(
             map(
                 lambda element: {
-                    rename_dict.get(e.tag, e.tag): validate_string(e.text)  # type: ignore
+                    rename_dict.get(e.tag, e.tag): _normalize(e.text)
                     for e in element.iter()
                     if e.tag != element_enum.name
                 },
@@ -111,7 +124,7 @@ class XMLHandler:
         ET.indent(self.tree)
 
         # Sorting elements by their text
-        sorted_elements = sorted(self.root.findall("*"), key=lambda e: e.tag)
+        sorted_elements = sorted(self.root, key=lambda e: e.tag)
         self.root[:] = sorted_elements
 
         # Rebuilding the XML tree with sorted elements
@@ -152,8 +165,7 @@ class XMLHandler:
         """
         xpath_query = xml_query(element_type, *elements, **tag_elements)
         logger.trace("{}", xpath_query)
-        elements = self.root.findall(xpath_query)  # type: ignore
-        yield from elements
+        yield from self.root.iterfind(xpath_query)
 
     def _remove_namespace(self, namespace: str) -> None:
         """Remove namespace in the passed document in place.
@@ -164,10 +176,14 @@ class XMLHandler:
         https://stackoverflow.com/questions/18159221/remove-namespace-and-prefix-from-xml-in-python-using-lxml
         """
         ns = "{%s}" % namespace  # noqa: UP031
-        nsl = len(ns)
+        # There are only a few distinct tags, so each one is stripped once and all the elements share the
+        # same string instead of holding a copy each.
+        tags: dict[str, str] = {}
         for elem in self.root.iter():
-            if elem.tag.startswith(ns):
-                elem.tag = elem.tag[nsl:]
+            tag = tags.get(elem.tag)
+            if tag is None:
+                tag = tags[elem.tag] = elem.tag.removeprefix(ns)
+            elem.tag = tag
 
 
 def xml_query(element_name: str, *tags, **tag_elements) -> str:
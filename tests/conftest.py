@@ -5,7 +5,7 @@ from _pytest.logging import LogCaptureFixture
 DATA_FOLDER = "tests/data"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def data_folder(pytestconfig):
     return pytestconfig.rootpath.joinpath(DATA_FOLDER)
 
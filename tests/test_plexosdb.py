@@ -1,2 +0,0 @@
-def test_smoke_test():
-    from plexosdb import PlexosSQLite  # noqa: F401
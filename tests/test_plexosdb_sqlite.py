@@ -1,13 +1,16 @@
 import pytest
-import shutil
 import xml.etree.ElementTree as ET  # noqa: N817
 from plexosdb.enums import ClassEnum, CollectionEnum, Schema
-from plexosdb.sqlite import PlexosSQLite
+from plexosdb import PlexosSQLite
+from plexosdb.sqlite import SYSTEM_CLASS_NAME
+from plexosdb.xml_handler import XMLHandler
+import sqlite3
 from sqlite3 import IntegrityError
 from collections.abc import Generator
 from pathlib import Path
 
 DB_FILENAME = "plexosdb.xml"
+GENERATOR_NAMES = ("gen1", "gen2", "gen3")
 
 
 @pytest.mark.skip(reason="Requires master file")
@@ -15,14 +18,42 @@ def db_empty() -> "PlexosSQLite":
     return PlexosSQLite()
 
 
+@pytest.fixture(scope="session")
+def xml_handler(data_folder: Path) -> XMLHandler:
+    # Parsing the XML dominates the setup of `db`, so it is only done once per session. Neither the handler
+    # nor the database write back to the XML, so it is read in place.
+    return XMLHandler.parse(fpath=data_folder / DB_FILENAME)
+
+
+@pytest.fixture(scope="session")
+def db_template(xml_handler: XMLHandler) -> PlexosSQLite:
+    return PlexosSQLite(xml_handler=xml_handler)
+
+
+def clone_db(db: PlexosSQLite) -> PlexosSQLite:
+    # Copying the pages of the template is much faster than populating a new database from the XML.
+    conn = sqlite3.connect(":memory:")
+    db._conn.backup(conn)
+    return PlexosSQLite.from_conn(conn)
+
+
 @pytest.fixture
-def db(data_folder: Path, tmp_path: Path) -> Generator[PlexosSQLite, None, None]:
-    xml_fname = data_folder / DB_FILENAME
-    xml_copy = tmp_path / f"copy_{DB_FILENAME}"
-    shutil.copy(xml_fname, xml_copy)
-    db = PlexosSQLite(xml_fname=str(xml_copy))
+def db(db_template: PlexosSQLite) -> Generator[PlexosSQLite, None, None]:
+    db = clone_db(db_template)
+    yield db
+
+
+@pytest.fixture(scope="session")
+def db_generators_template(db_template: PlexosSQLite) -> PlexosSQLite:
+    db = clone_db(db_template)
+    db.add_objects(GENERATOR_NAMES, ClassEnum.Generator, CollectionEnum.Generators)
+    return db
+
+
+@pytest.fixture
+def db_with_generators(db_generators_template: PlexosSQLite) -> Generator[PlexosSQLite, None, None]:
+    db = clone_db(db_generators_template)
     yield db
-    xml_copy.unlink()
 
 
 def test_database_initialization(db):
@@ -31,8 +62,18 @@ def test_database_initialization(db):
     assert db._conn
 
 
-@pytest.mark.skip(reason="Requires master file")
-@pytest.mark.empty_database
+@pytest.fixture(params=[True, False], ids=["returning", "max_id"])
+def supports_returning(request, monkeypatch) -> bool:
+    # Recover the new ids with and without `INSERT ... RETURNING`.
+    monkeypatch.setattr("plexosdb.sqlite.SUPPORTS_RETURNING", request.param)
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def schema_tables(db_template: PlexosSQLite) -> frozenset[str]:
+    return frozenset(row[0] for row in db_template.query("SELECT name FROM sqlite_master WHERE type='table'"))
+
+
 @pytest.mark.parametrize(
     "table_name",
     [
@@ -71,10 +112,13 @@ def test_database_initialization(db):
         "t_band",
     ],
 )
-def test_create_table_schema(db_empty, table_name):
-    with db_empty._conn as conn:
-        result = conn.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table_name}'")
-    assert result.fetchone() is not None
+def test_create_table_schema(schema_tables, table_name):
+    assert table_name in schema_tables
+
+
+@pytest.mark.parametrize("index_name", ["ix_membership_lookup", "ix_object_name_class"])
+def test_create_indexes(db, index_name):
+    assert db.fetchone("SELECT 1 FROM sqlite_master WHERE type='index' AND name = ?", (index_name,))
 
 
 @pytest.mark.get_functions
@@ -109,33 +153,31 @@ def test_get_id(db):
 
 
 @pytest.mark.get_functions
-def test_get_collection_id(db):
-    collection_name = CollectionEnum.Generators
-    parent_class = ClassEnum.System
-    collection_id = db.get_collection_id(collection_name, parent_class=parent_class)
+def test_get_class_id(db):
+    class_id = db.get_class_id(ClassEnum.Generator)
+    class_id_query = db.query("SELECT class_id FROM t_class WHERE name = ?", (ClassEnum.Generator,))[0][0]
+    assert class_id == class_id_query
+    assert db._get_id(Schema.Class, ClassEnum.Generator.name) == class_id
 
-    collection_query = f"""
-    SELECT
-        collection_id
-    FROM
-        t_collection as collection
-    LEFT JOIN
-        t_class AS parent_class ON parent_class.class_id = collection.parent_class_id
-    WHERE
-        collection.name = '{collection_name}'
-    AND
-        parent_class.name = '{parent_class}'
-    """
+    # Class names are matched ignoring spaces, e.g., "Data File" and "DataFile"
+    assert db.get_class_id(ClassEnum.DataFile) == db.get_class_id(ClassEnum.DataFile.name)
 
-    collection_id_query = db.query(collection_query)[0][0]
-    assert collection_id == collection_id_query
+    with pytest.raises(KeyError):
+        _ = db.get_class_id("NotExistingClass")
 
-    collection_name = CollectionEnum.Generators
-    parent_class = ClassEnum.Emission
-    child_class = ClassEnum.Generator
+
+@pytest.mark.get_functions
+@pytest.mark.parametrize(
+    "collection_name, parent_class, child_class",
+    [
+        (CollectionEnum.Generators, ClassEnum.System, None),
+        (CollectionEnum.Generators, ClassEnum.Emission, ClassEnum.Generator),
+    ],
+)
+def test_get_collection_id(db, collection_name, parent_class, child_class):
     collection_id = db.get_collection_id(collection_name, parent_class=parent_class, child_class=child_class)
 
-    collection_query = f"""
+    collection_query = """
     SELECT
         collection_id
     FROM
@@ -145,19 +187,29 @@ def test_get_collection_id(db):
     LEFT JOIN
         t_class AS child_class ON child_class.class_id = collection.child_class_id
     WHERE
-        collection.name = '{collection_name}'
+        collection.name = :collection
     AND
-        parent_class.name = '{parent_class}'
+        parent_class.name = :parent_class
     AND
-        child_class.name = '{child_class}'
+        (:child_class IS NULL OR child_class.name = :child_class)
     """
-    collection_id_query = db.query(collection_query)[0][0]
+    params = {"collection": collection_name, "parent_class": parent_class, "child_class": child_class}
+    collection_id_query = db.query(collection_query, params)[0][0]
     assert collection_id == collection_id_query
 
+
+@pytest.mark.get_functions
+def test_get_collection_id_errors(db):
     # Assert that return of multiple collections
     with pytest.raises(ValueError):
         _ = db.get_collection_id(CollectionEnum.Generators)
 
+    # Assert that a collection that does not exist for the classes raises
+    with pytest.raises(KeyError):
+        _ = db.get_collection_id(
+            CollectionEnum.Generators, parent_class=ClassEnum.Fuel, child_class=ClassEnum.Node
+        )
+
 
 @pytest.mark.get_functions
 def test_get_object_id(db):
@@ -195,27 +247,83 @@ def test_get_object_id(db):
 
 
 @pytest.mark.get_functions
-def test_get_memberships(db):
-    # Test Node
-    node_name = "Node 1"
-    node_id = db.add_object(node_name, ClassEnum.Node, CollectionEnum.Nodes, description="Test Node")
-    assert node_id
+def test_get_id_cache(db):
+    gen_id = db.add_object("gen1", ClassEnum.Generator, CollectionEnum.Generators, category_name="PV Gens")
+    assert db._get_id(Schema.Objects, "gen1") == gen_id
 
-    # Test generator
-    gen_01_name = "gen1"
-    gen_id = db.add_object(
-        gen_01_name, ClassEnum.Generator, CollectionEnum.Generators, description="Test Gen"
-    )
-    assert gen_id
+    # The category is part of the cached lookup.
+    assert db.get_object_id("gen1", class_name=ClassEnum.Generator, category_name="PV Gens") == gen_id
+    with pytest.raises(KeyError):
+        _ = db.get_object_id("gen1", class_name=ClassEnum.Generator, category_name="-")
 
-    # Add membership to node_id
-    db.add_membership(
-        gen_01_name,
-        node_name,
-        parent_class=ClassEnum.Generator,
-        child_class=ClassEnum.Node,
-        collection=CollectionEnum.Nodes,
+    # Adding an object with the same name makes the lookup without class ambiguous.
+    _ = db.add_object("gen1", ClassEnum.Node, CollectionEnum.Nodes)
+    with pytest.raises(ValueError):
+        _ = db._get_id(Schema.Objects, "gen1")
+    assert db.get_object_id("gen1", class_name=ClassEnum.Generator) == gen_id
+
+
+@pytest.mark.get_functions
+def test_get_id_cache_case_sensitive_categories(db):
+    category_id = db.add_category("PV Gens", class_name=ClassEnum.Generator)
+    assert db.get_category_id("PV Gens", ClassEnum.Generator) == category_id
+    with pytest.raises(KeyError):
+        _ = db.get_category_id("pv gens", ClassEnum.Generator)
+
+    # Category names only differing by case are different categories.
+    _ = db.add_object("gen1", ClassEnum.Generator, CollectionEnum.Generators, category_name="pv gens")
+    lower_category_id = db.get_category_id("pv gens", ClassEnum.Generator)
+    assert lower_category_id != category_id
+    assert db.query("SELECT category_id FROM t_object WHERE name = 'gen1'")[0][0] == lower_category_id
+
+
+@pytest.mark.get_functions
+def test_get_object_id_index(db):
+    system_id = db.get_object_id(SYSTEM_CLASS_NAME, class_name=ClassEnum.System)
+    assert db.get_object_id(SYSTEM_CLASS_NAME.upper(), class_name=ClassEnum.System) == system_id
+
+    # Objects added with the API are indexed and objects inserted directly are found on the database.
+    gen_id = db.add_object("gen1", ClassEnum.Generator, CollectionEnum.Generators)
+    assert db.get_object_id("gen1", class_name=ClassEnum.Generator) == gen_id
+    db.execute_query(
+        "INSERT INTO t_object(name, class_id, category_id, GUID) "
+        "SELECT 'gen2', class_id, category_id, 'guid' FROM t_object WHERE object_id = ?",
+        (gen_id,),
     )
+    assert db.get_object_id("gen2", class_name=ClassEnum.Generator) == gen_id + 1
+    with pytest.raises(KeyError):
+        _ = db.get_object_id("gen3", class_name=ClassEnum.Generator)
+
+
+def test_get_object_id_non_ascii(db):
+    unit_id = db.add_object("Ünit", ClassEnum.Generator, CollectionEnum.Generators)
+    # NOCASE only folds the ASCII letters, so the index matches what the database finds.
+    assert db.get_object_id("ÜNIT", class_name=ClassEnum.Generator) == unit_id
+    with pytest.raises(KeyError):
+        _ = db.get_object_id("ünit", class_name=ClassEnum.Generator)
+    with pytest.raises(KeyError):
+        _ = db._get_id(Schema.Objects, "ünit", class_name=ClassEnum.Generator)
+
+
+@pytest.mark.get_functions
+def test_get_memberships(db_with_generators):
+    db = db_with_generators
+    gen_01_name, gen_02_name, gen_03_name = GENERATOR_NAMES
+
+    # Test Node
+    node_name = "Node 1"
+    with db.bulk_writes():
+        node_id = db.add_object(node_name, ClassEnum.Node, CollectionEnum.Nodes, description="Test Node")
+        assert node_id
+
+        # Add membership to node_id
+        db.add_membership(
+            gen_01_name,
+            node_name,
+            parent_class=ClassEnum.Generator,
+            child_class=ClassEnum.Node,
+            collection=CollectionEnum.Nodes,
+        )
 
     memberships = db.get_memberships(gen_01_name, object_class=ClassEnum.Generator)
 
@@ -227,11 +335,7 @@ def test_get_memberships(db):
     with pytest.raises(KeyError):
         _ = db.get_memberships("FakeGen", object_class=ClassEnum.Generator)
 
-    # Add a second generator
-    gen_02_name = "gen2"
-    gen_id = db.add_object(
-        gen_02_name, ClassEnum.Generator, CollectionEnum.Generators, description="Test Gen2"
-    )
+    # Add the second generator
     membership_id = db.add_membership(
         gen_02_name,
         node_name,
@@ -261,10 +365,6 @@ def test_get_memberships(db):
     assert memberships[1][3] == node_name
 
     # Test KeyError from get_membership_id w/o membership
-    gen_03_name = "gen3"
-    gen_id = db.add_object(
-        gen_03_name, ClassEnum.Generator, CollectionEnum.Generators, description="Test Gen3"
-    )
     with pytest.raises(KeyError):
         _ = db.get_membership_id(
             child_name=node_name,
@@ -274,6 +374,16 @@ def test_get_memberships(db):
             collection=CollectionEnum.Nodes,
         )
 
+    # Test KeyError from get_membership_id w/o object
+    with pytest.raises(KeyError, match="No object found"):
+        _ = db.get_membership_id(
+            child_name="FakeNode",
+            parent_name=gen_02_name,
+            child_class=ClassEnum.Node,
+            parent_class=ClassEnum.Generator,
+            collection=CollectionEnum.Nodes,
+        )
+
 
 @pytest.mark.get_functions
 def test_get_property_id(db):
@@ -290,6 +400,25 @@ def test_get_property_id(db):
         )
 
 
+@pytest.mark.get_functions
+def test_get_valid_properties(db):
+    collection = CollectionEnum.Generators
+    valid_properties = db.get_valid_properties(
+        collection, parent_class=ClassEnum.System, child_class=ClassEnum.Generator
+    )
+    assert "Max Capacity" in valid_properties
+
+    property_id = db.get_property_id(
+        "Max Capacity", collection=collection, parent_class=ClassEnum.System, child_class=ClassEnum.Generator
+    )
+    collection_id = db.get_collection_id(collection, parent_class=ClassEnum.System)
+    property_id_query = db.query(
+        "SELECT property_id FROM t_property WHERE name = ? AND collection_id = ?",
+        ("Max Capacity", collection_id),
+    )[0][0]
+    assert property_id == property_id_query
+
+
 @pytest.mark.add_functions
 def test_add_category(db):
     new_category = "new_generator_category"
@@ -388,6 +517,61 @@ def test_add_object(db):
     assert membership_tuple[4] == model_collection_id
 
 
+@pytest.mark.add_functions
+@pytest.mark.usefixtures("supports_returning")
+def test_add_objects(db):
+    object_names = ["gen_a", "gen_b", "gen_c"]
+    object_ids = db.add_objects(
+        object_names, ClassEnum.Generator, CollectionEnum.Generators, category_name="Bulk Gens"
+    )
+    assert len(object_ids) == 3
+    for object_name, object_id in zip(object_names, object_ids):
+        assert db.get_object_id(object_name, class_name=ClassEnum.Generator, category_name="Bulk Gens") == (
+            object_id
+        )
+        assert db.get_membership_id(
+            child_name=object_name,
+            parent_name=SYSTEM_CLASS_NAME,
+            child_class=ClassEnum.Generator,
+            parent_class=ClassEnum.System,
+            collection=CollectionEnum.Generators,
+        )
+
+    with pytest.raises(IntegrityError):
+        db.add_objects(["gen_a"], ClassEnum.Generator, CollectionEnum.Generators)
+
+
+@pytest.mark.add_functions
+@pytest.mark.usefixtures("supports_returning")
+def test_add_memberships(db_with_generators):
+    db = db_with_generators
+    db.add_objects(["Node 1", "Node 2"], ClassEnum.Node, CollectionEnum.Nodes)
+    object_pairs = [("gen1", "Node 1"), ("gen2", "Node 1"), ("gen3", "Node 2")]
+    membership_ids = db.add_memberships(
+        object_pairs,
+        parent_class=ClassEnum.Generator,
+        child_class=ClassEnum.Node,
+        collection=CollectionEnum.Nodes,
+    )
+    assert len(membership_ids) == 3
+    for (parent_name, child_name), membership_id in zip(object_pairs, membership_ids):
+        assert membership_id == db.get_membership_id(
+            child_name=child_name,
+            parent_name=parent_name,
+            child_class=ClassEnum.Node,
+            parent_class=ClassEnum.Generator,
+            collection=CollectionEnum.Nodes,
+        )
+
+    with pytest.raises(KeyError):
+        db.add_memberships(
+            [("gen1", "FakeNode")],
+            parent_class=ClassEnum.Generator,
+            child_class=ClassEnum.Node,
+            collection=CollectionEnum.Nodes,
+        )
+
+
 @pytest.mark.add_functions
 def test_add_atribute(db):
     # Raise error if object does not exists
@@ -487,6 +671,8 @@ def test_add_property(db):
         text={"Data File": "test.csv"},
     )
     assert data_id
+    result = db.query("SELECT class_id, value FROM t_text WHERE data_id = ?", (data_id,))
+    assert result == [(db._get_id(Schema.Class, "Data File"), "test.csv")]
 
     # Test Scenarios
     scenario = "Awesome Scenario"
@@ -530,6 +716,18 @@ def test_add_property(db):
         )
 
 
+@pytest.mark.add_functions
+def test_add_property_without_object(db):
+    with pytest.raises(KeyError, match="No object found"):
+        _ = db.add_property(
+            "NotExistingGenerator",
+            "Max Capacity",
+            100,
+            object_class=ClassEnum.Generator,
+            collection=CollectionEnum.Generators,
+        )
+
+
 @pytest.mark.add_functions
 def test_add_report(db):
     input_report = {
@@ -560,30 +758,59 @@ def test_add_report(db):
 
 
 @pytest.mark.add_functions
-def test_add_property_from_records(db):
-    records = [
-        {"name": "gen1", "Max Capacity": 100},
-        {"name": "gen2", "Max Capacity": 200},
-        {"name": "gen3", "Max Capacity": 300},
-    ]
+def test_add_property_from_records(db_with_generators):
+    db = db_with_generators
 
     # Asser that we can not add properties for non-existant objects
     with pytest.raises(KeyError):
         db.add_property_from_records(
-            records,
+            [{"name": "FakeGen", "Max Capacity": 100}],
             parent_class=ClassEnum.System,
             collection=CollectionEnum.Generators,
             scenario="Test",
         )
 
-    for record in records:
-        _ = db.add_object(record["name"], ClassEnum.Generator, CollectionEnum.Generators)
-    db.add_property_from_records(
+    records = [
+        {"name": generator_name, "Max Capacity": value}
+        for generator_name, value in zip(GENERATOR_NAMES, [100, 200, 300])
+    ]
+    data_ids = db.add_property_from_records(
+        records,
+        parent_class=ClassEnum.System,
+        collection=CollectionEnum.Generators,
+        scenario="Test",
+    )
+    assert len(data_ids) == 3
+    result = db.query(
+        f"SELECT value FROM t_data WHERE data_id IN ({', '.join('?' * len(data_ids))}) ORDER BY data_id",
+        data_ids,
+    )
+    assert [d[0] for d in result] == [100, 200, 300]
+
+    property_id = db.get_property_id(
+        "Max Capacity",
+        collection=CollectionEnum.Generators,
+        parent_class=ClassEnum.System,
+        child_class=ClassEnum.Generator,
+    )
+    result = db.query("SELECT is_dynamic, is_enabled FROM t_property WHERE property_id = ?", (property_id,))
+    assert result[0] == (1, 1)
+
+    # Properties get tagged with the scenario, also when the scenario already exists.
+    scenario_id = db.get_object_id("Test", class_name=ClassEnum.Scenario)
+    data_ids += db.add_property_from_records(
         records,
         parent_class=ClassEnum.System,
         collection=CollectionEnum.Generators,
         scenario="Test",
     )
+    result = db.query("SELECT data_id FROM t_tag WHERE object_id = ? ORDER BY data_id", (scenario_id,))
+    assert [d[0] for d in result] == data_ids
+
+
+def test_fetchone(db):
+    assert db.fetchone("SELECT class_id FROM t_class WHERE name = ?", ("System",)) == (1,)
+    assert db.fetchone("SELECT class_id FROM t_class WHERE name = ?", ("NotExistingClass",)) is None
 
 
 def test_create_table_element(db):
@@ -613,6 +840,11 @@ def test_create_table_element(db):
                 else:
                     assert column_element.text == str(column_value)
 
+    # Null values are skipped
+    db._create_table_element(root, column_types, table_name, [(3, None, 1)])
+    assert root[-1].find("name") is None
+    assert root[-1].find("active").text == "true"
+
 
 def test_populate_database(db):
     with pytest.raises(FileNotFoundError):
@@ -642,3 +874,136 @@ def test_save(db, tmp_path):
     fpath = tmp_path / fname
     db.save(fpath=fpath)
     assert fpath.exists()
+
+
+@pytest.mark.add_functions
+@pytest.mark.usefixtures("supports_returning")
+def test_insert_data(db_with_generators):
+    db = db_with_generators
+    membership_id = db.get_membership_id(
+        child_name="gen1",
+        parent_name="System",
+        child_class=ClassEnum.Generator,
+        parent_class=ClassEnum.System,
+        collection=CollectionEnum.Generators,
+    )
+    property_id = db.get_property_id(
+        "Max Capacity",
+        collection=CollectionEnum.Generators,
+        parent_class=ClassEnum.System,
+        child_class=ClassEnum.Generator,
+    )
+    rows = [(membership_id, property_id, 100), (membership_id, property_id, 200)]
+
+    data_ids = db._insert_data(rows)
+    assert len(data_ids) == 2
+    result = db.query("SELECT value FROM t_data WHERE data_id IN (?, ?) ORDER BY data_id", data_ids)
+    assert [d[0] for d in result] == [100, 200]
+
+    # Inserting the same rows again only returns the new ids.
+    new_data_ids = db._insert_data(rows)
+    assert len(new_data_ids) == 2
+    assert not set(new_data_ids) & set(data_ids)
+
+    # Chunks smaller than the number of rows return all the ids in insertion order.
+    chunked_data_ids = db._insert_data(rows * 3, chunksize=2)
+    assert len(chunked_data_ids) == 6
+    result = db.query(
+        f"SELECT value FROM t_data WHERE data_id IN ({', '.join('?' * 6)}) ORDER BY data_id", chunked_data_ids
+    )
+    assert [d[0] for d in result] == [100, 200] * 3
+    assert chunked_data_ids == sorted(chunked_data_ids)
+
+    # Null values also return their ids.
+    null_data_ids = db._insert_data([(membership_id, property_id, None)])
+    assert len(null_data_ids) == 1
+    assert db.query("SELECT value FROM t_data WHERE data_id = ?", null_data_ids) == [(None,)]
+
+
+@pytest.mark.add_functions
+@pytest.mark.parametrize("chunksize", [1, 2, 500])
+def test_ingest_from_records(db, chunksize):
+    class_id = db.get_class_id(ClassEnum.Generator)
+    records = [
+        {"class_id": class_id, "rank": 10, "name": "ingested_1"},
+        {"class_id": class_id, "rank": 11, "name": "ingested_2"},
+        {"class_id": class_id, "rank": 12, "name": "ingested_3", "state": 1},
+        {"class_id": class_id, "rank": 13, "name": "ingested_4"},
+    ]
+    db.ingest_from_records(Schema.Categories.name, records, chunksize=chunksize)
+
+    result = db.query("SELECT name, state FROM t_category WHERE name LIKE 'ingested_%' ORDER BY name")
+    assert result == [("ingested_1", None), ("ingested_2", None), ("ingested_3", 1), ("ingested_4", None)]
+
+
+def test_bulk_mode(db):
+    cache_size = db.query("PRAGMA cache_size")[0][0]
+    cache_spill = db.query("PRAGMA cache_spill")[0][0]
+    with db._bulk_mode(cache_size=-1000):
+        assert db.query("PRAGMA cache_size")[0][0] == -1000
+        assert db.query("PRAGMA cache_spill")[0][0] == 0
+    assert db.query("PRAGMA cache_size")[0][0] == cache_size
+    assert db.query("PRAGMA cache_spill")[0][0] == cache_spill
+
+
+def test_bulk_writes(db):
+    with db.bulk_writes():
+        db.add_object("TestGen", ClassEnum.Generator, CollectionEnum.Generators)
+        db.add_property(
+            "TestGen",
+            "Max Capacity",
+            100,
+            object_class=ClassEnum.Generator,
+            collection=CollectionEnum.Generators,
+        )
+        assert db._conn.in_transaction
+    assert not db._conn.in_transaction
+    assert db.get_object_id("TestGen", class_name=ClassEnum.Generator)
+
+
+def test_from_conn(db, db_template):
+    assert isinstance(db, PlexosSQLite)
+    assert db._conn is not db_template._conn
+    assert db.query("SELECT count(*) FROM t_object") == db_template.query("SELECT count(*) FROM t_object")
+
+    db.add_object("TestGen", ClassEnum.Generator, CollectionEnum.Generators)
+    assert db.get_object_id("TestGen", class_name=ClassEnum.Generator)
+    assert not db_template.check_id_exists(Schema.Objects, "TestGen", class_name=ClassEnum.Generator)
+
+
+def test_sqlite_config(db_template):
+    assert db_template.query("PRAGMA synchronous")[0][0] == 0
+    assert db_template.query("PRAGMA journal_mode")[0][0] == "off"
+    assert db_template.query("PRAGMA temp_store")[0][0] == 2
+
+
+@pytest.fixture
+def file_db(db_template, tmp_path):
+    conn = sqlite3.connect(tmp_path / "plexos.db")
+    db_template._conn.backup(conn)
+    yield PlexosSQLite.from_conn(conn)
+    conn.close()
+
+
+def test_from_conn_keeps_pragmas(file_db):
+    assert file_db.query("PRAGMA journal_mode")[0][0] == "delete"
+    assert file_db.query("PRAGMA synchronous")[0][0] == 2
+
+
+def test_bulk_writes_rollback_clears_cache(file_db):
+    db = file_db
+    with pytest.raises(ValueError), db.bulk_writes():
+        db.add_object("ghost", ClassEnum.Generator, CollectionEnum.Generators, category_name="GhostCat")
+        assert db.get_object_id("ghost", class_name=ClassEnum.Generator)
+        raise ValueError
+
+    assert not db.query("SELECT object_id FROM t_object WHERE name = 'ghost'")
+    with pytest.raises(KeyError):
+        db.get_object_id("ghost", class_name=ClassEnum.Generator)
+    with pytest.raises(KeyError):
+        db.get_category_id("GhostCat", ClassEnum.Generator)
+
+
+def test_page_size(data_folder):
+    db = PlexosSQLite(xml_fname=str(data_folder / DB_FILENAME), page_size=8192)
+    assert db.query("PRAGMA page_size")[0][0] == 8192
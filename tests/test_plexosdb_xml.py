@@ -63,6 +63,21 @@ def test_get_records(xml_handler):
     assert elements[1]["name"] == "SolarPV01"
 
 
+def test_get_records_repeated_values(tmp_path):
+    fpath = tmp_path / "repeated.xml"
+    fpath.write_text(
+        f'<MasterDataSet xmlns="{NAMESPACE}">'
+        "<t_object><object_id>1</object_id><name>gen1</name><description>[1, 2]</description></t_object>"
+        "<t_object><object_id>2</object_id><name>gen2</name><description>[1, 2]</description></t_object>"
+        "</MasterDataSet>"
+    )
+    handler = XMLHandler.parse(fpath=fpath)
+    records = handler.get_records(Schema.Objects)
+    assert [record["object_id"] for record in records] == [1, 2]
+    assert records[0]["description"] == records[1]["description"] == [1, 2]
+    assert records[0]["description"] is not records[1]["description"]
+
+
 def test_save_xml(tmp_path):
     handler = XMLHandler.parse(fpath=XML_FPATH, in_memory=True)
     handler.to_xml(tmp_path / ".xml")
@@ -0,0 +1,29 @@
+import pytest
+from plexosdb.utils import batched, get_sql_query, nocase
+
+
+@pytest.mark.parametrize(
+    "fname", ["schema.sql", "queries/object_query.sql", "queries/simple_object_query.sql"]
+)
+def test_get_sql_query(fname):
+    query = get_sql_query(fname)
+    assert isinstance(query, str)
+    assert query
+    assert get_sql_query(fname) is query
+
+
+@pytest.mark.parametrize(
+    "iterable, n, expected",
+    [
+        (range(5), 2, [(0, 1), (2, 3), (4,)]),
+        ([1, 2, 3], 3, [(1, 2, 3)]),
+        ([], 2, []),
+    ],
+)
+def test_batched(iterable, n, expected):
+    assert list(batched(iterable, n)) == expected
+
+
+@pytest.mark.parametrize("name, expected", [("Gen A", "gen a"), ("ÜNIT", "Ünit"), ("ß", "ß")])
+def test_nocase(name, expected):
+    assert nocase(name) == expected